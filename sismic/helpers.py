@@ -91,7 +91,7 @@ def run_in_background(interpreter: Interpreter,
     thread = threading.Thread(target=_task)
 
     def stop_thread():
-        interpreter._configuration = set()
+        interpreter._set_configuration([])
 
     thread.stop = stop_thread  # type: ignore
 
@@ -2,8 +2,8 @@ import bisect
 import warnings
 
 from itertools import combinations
-from typing import (Any, Callable, Dict, Iterable, List, Mapping, Optional,
-                    Set, Tuple, Union, cast)
+from typing import (Any, Callable, Dict, FrozenSet, Iterable, List, Mapping,
+                    Optional, Set, Tuple, Union, cast)
 
 from .listener import InternalEventListener, PropertyStatechartListener
 from ..utilities import sorted_groupby
@@ -12,10 +12,10 @@ from ..code import Evaluator, PythonEvaluator
 from ..exceptions import (ConflictingTransitionsError, InvariantError,
                           NonDeterminismError, PostconditionError,
                           PreconditionError)
-from ..model import (CompoundState, DeepHistoryState, Event,
-                     FinalState, InternalEvent, MacroStep, MetaEvent,
-                     MicroStep, OrthogonalState, ShallowHistoryState,
-                     Statechart, StateMixin, Transition)
+from ..model import (CompoundState, DeepHistoryState, Event, FinalState,
+                     HistoryStateMixin, InternalEvent, MacroStep, MetaEvent,
+                     MicroStep, OrthogonalState, Statechart, StateMixin,
+                     Transition)
 
 __all__ = ['Interpreter']
 
@@ -48,10 +48,13 @@ class Interpreter:
     :param ignore_contract: set to True to ignore contract checking during the execution.
     """
 
+    #: Maximal number of entries in the cache of ordered source states
+    _sources_cache_size = 1024
+
     def __init__(self, statechart: Statechart, *,
                  evaluator_klass: Callable[..., Evaluator] = PythonEvaluator,
-                 initial_context: Mapping[str, Any] = None,
-                 clock: Clock = None,
+                 initial_context: Optional[Mapping[str, Any]] = None,
+                 clock: Optional[Clock] = None,
                  ignore_contract: bool = False) -> None:
         # Internal variables
         self._ignore_contract = ignore_contract
@@ -59,6 +62,25 @@ class Interpreter:
 
         self._initialized = False
 
+        # Cached structure of the statechart, as it is repeatedly queried during execution
+        self._cache_version = None  # type: Optional[int]
+        self._states = {}  # type: Dict[str, StateMixin]
+        self._depth = {}  # type: Dict[str, int]
+        self._ancestors = {}  # type: Dict[str, Tuple[str, ...]]
+        self._descendants_set = {}  # type: Dict[str, FrozenSet[str]]
+        self._document_order = {}  # type: Dict[str, int]
+        self._lca = {}  # type: Dict[Tuple[str, str], Optional[str]]
+        self._transitions_from = {}  # type: Dict[str, List[Transition]]
+        self._sources_cache = {}  # type: Dict[Tuple[FrozenSet[str], bool], List]
+        self._root = None  # type: Optional[str]
+        self._root_final_states = set()  # type: Set[str]
+        self._compound_states = set()  # type: Set[str]
+        self._orthogonal_states = set()  # type: Set[str]
+        self._history_states = set()  # type: Set[str]
+        self._deep_history_states = set()  # type: Set[str]
+        self._history_children = {}  # type: Dict[str, List[str]]
+        self._update_cache()
+
         # Internal clock
         self.clock = SimulatedClock() if clock is None else clock
         self._time = self.clock.time
@@ -68,6 +90,7 @@ class Interpreter:
 
         # Set of active states
         self._configuration = set()  # type: Set[str]
+        self._sorted_configuration = None  # type: Optional[List[str]]
 
         # Entry and idle times
         self._entry_time = dict()  # type: Dict[str, float]
@@ -107,7 +130,23 @@ class Interpreter:
         List of active states names, ordered by depth. Ties are broken according to the
         lexicographic order on the state name.
         """
-        return sorted(self._configuration, key=lambda s: (self._statechart.depth_for(s), s))
+        self._update_cache()
+        if self._sorted_configuration is None:
+            # Active states that no longer exist are delegated to depth_for, which raises
+            depth = self._depth
+            self._sorted_configuration = sorted(
+                self._configuration,
+                key=lambda s: (depth[s] if s in depth else self._statechart.depth_for(s), s))
+        return list(self._sorted_configuration)
+
+    def _set_configuration(self, names: Iterable[str]) -> None:
+        """
+        Replace the set of active states by given state names.
+
+        :param names: names of the active states.
+        """
+        self._configuration = set(names)
+        self._sorted_configuration = None
 
     @property
     def context(self) -> Mapping[str, Any]:
@@ -196,7 +235,8 @@ class Interpreter:
         return listener
 
     def bind_property_statechart(
-            self, statechart: Statechart, *, interpreter_klass: Callable = None) -> Callable[
+            self, statechart: Statechart, *,
+            interpreter_klass: Optional[Callable] = None) -> Callable[
             [MetaEvent],
             Any]:
         """
@@ -227,7 +267,7 @@ class Interpreter:
                 'Passing an interpreter to bind_property_statechart is deprecated since 1.4.0. '
                 'Use interpreter_klass instead.',
                 DeprecationWarning)
-            interpreter = statechart
+            interpreter = statechart  # type: Interpreter
             interpreter.clock = SynchronizedClock(self)
         else:
             interpreter_klass = Interpreter if interpreter_klass is None else interpreter_klass
@@ -296,6 +336,9 @@ class Interpreter:
         # Store time to have a consistent time value during this step
         self._time = self.clock.time
 
+        # Take into account any change made to the statechart since last step
+        self._update_cache()
+
         # Reset the list of events that were sent
         self._sent_events.clear()
 
@@ -333,8 +376,7 @@ class Interpreter:
         # Check state invariants
         configuration = self.configuration  # Use self.configuration to benefit from the sorting
         for name in configuration:
-            state = self._statechart.state_for(name)
-            self._evaluate_contract_conditions(state, 'invariants', macro_step)
+            self._evaluate_contract_conditions(self._states[name], 'invariants', macro_step)
 
         self._raise_event(MetaEvent('step ended'))
 
@@ -351,12 +393,19 @@ class Interpreter:
         else:
             queue = self._external_queue
 
+        def key(t):
+            return t[0], not isinstance(t[1], InternalEvent)
+
         time = self.time + getattr(event, 'delay', 0)
-        position = bisect.bisect_right(  # type: ignore
-            _KeyifyList(queue, lambda t: (t[0], not isinstance(t[1], InternalEvent))),
-            (time, not isinstance(event, InternalEvent))
-        )
-        queue.insert(position, (time, event))
+
+        # Events are usually queued in order (e.g. a burst of events sent by a step), in which
+        # case there is no need to look for their position.
+        if len(queue) == 0 or key(queue[-1]) <= key((time, event)):
+            queue.append((time, event))
+        else:
+            position = bisect.bisect_right(  # type: ignore
+                _KeyifyList(queue, key), key((time, event)))
+            queue.insert(position, (time, event))
 
     def _raise_event(self, event: Union[InternalEvent, MetaEvent]) -> None:
         """
@@ -415,80 +464,95 @@ class Interpreter:
         :return: list of triggered transitions.
         """
         selected_transitions = []  # type: List[Transition]
-        considered_transitions = []  # type: List[Transition]
-        _state_depth_cache = dict()  # type: Dict[str, int]
-
-        # Select triggerable (based on event) transitions for considered states
-        for transition in self._statechart.transitions:
-            if transition.source in states:
-                if transition.event is None or transition.event == getattr(event, 'name', None):
-                    # Compute order based on depth
-                    if transition.source not in _state_depth_cache:
-                        _state_depth_cache[transition.source] = self._statechart.depth_for(
-                            transition.source)
-
-                    considered_transitions.append(transition)
+        evaluate_guard = self._evaluator.evaluate_guard
+        event_name = getattr(event, 'name', None)
+
+        # The order in which source states are considered only depends on the states, and is
+        # cached. Transitions attributes (event, guard, priority) are public and can be changed
+        # at any time, they are therefore always considered at selection time.
+        states = frozenset(states)
+        key = (states, inner_first)
+        sources = self._sources_cache.get(key)
+        if sources is None:
+            sources = self._sort_sources(states, inner_first=inner_first)
+            if len(self._sources_cache) >= self._sources_cache_size:
+                self._sources_cache.clear()
+            self._sources_cache[key] = sources
 
         # Which states should be selected to satisfy depth ordering?
+        ignored_state_selector = None  # type: Optional[Callable[[str], Iterable[str]]]
         if inner_first:
-            ignored_state_selector = self._statechart.ancestors_for
+            ignored_state_selector = self._ancestors.__getitem__
         else:
-            ignored_state_selector = self._statechart.descendants_for
+            ignored_state_selector = self._descendants_set.__getitem__
         ignored_states = set()  # type: Set[str]
 
-        # Group and sort transitions based on the event
-        def eventless_first_order(t):
-            return t.event is not None
+        # Group and sort transitions based on their priority
+        def priority_order(t):
+            return t.priority
 
-        for has_event, transitions in sorted_groupby(
-                considered_transitions, key=eventless_first_order, reverse=not eventless_first):
+        # Consider eventless transitions and transitions with an event separately
+        for has_event in ((False, True) if eventless_first else (True, False)):
             # If there are selected transitions (from previous group), ignore new ones
             if len(selected_transitions) > 0:
                 break
 
+            if has_event and event_name is None:
+                continue
+
             # Event shouldn't be exposed to guards if we're processing eventless transition
             exposed_event = event if has_event else None
 
-            # Group and sort transitions based on the source state depth
-            def depth_order(t):
-                return _state_depth_cache[t.source]
-
-            for _, transitions in sorted_groupby(transitions, key=depth_order, reverse=inner_first):
-                # Group and sort transitions based on the source state
-                def state_order(t):
-                    return t.source  # we just want states to be grouped here
-
-                for source, transitions in sorted_groupby(transitions, key=state_order):
-                    # Do not considered ignored states
-                    if source in ignored_states:
-                        continue
-
-                    has_found_transitions = False
-
-                    # Group and sort transitions based on their priority
-                    def priority_order(t):
-                        return t.priority
-
-                    for _, transitions in sorted_groupby(
-                            transitions, key=priority_order, reverse=True):
-                        for transition in transitions:
-                            if transition.guard is None or self._evaluator.evaluate_guard(
-                                    transition, exposed_event):
-                                # Add transition to the list of selected ones
-                                selected_transitions.append(transition)
-                                has_found_transitions = True
-
-                        # Ignore ancestors/descendants w.r.t. inner-first/source state
-                        if has_found_transitions:
-                            for state in ignored_state_selector(source):
-                                ignored_states.add(state)
-                            # Also ignore current state, as we found transitions in a higher
-                            # priority class
-                            ignored_states.add(source)
-                            break
+            for source, transitions in sources:
+                # Do not considered ignored states
+                if source in ignored_states:
+                    continue
+
+                # Select triggerable (based on event) transitions
+                if has_event:
+                    transitions = [t for t in transitions if t.event == event_name]
+                else:
+                    transitions = [t for t in transitions if t.event is None]
+
+                has_found_transitions = False
+
+                for _, transitions in sorted_groupby(
+                        transitions, key=priority_order, reverse=True):
+                    for transition in transitions:
+                        if transition.guard is None or evaluate_guard(
+                                transition, exposed_event):
+                            # Add transition to the list of selected ones
+                            selected_transitions.append(transition)
+                            has_found_transitions = True
+
+                    # Ignore ancestors/descendants w.r.t. inner-first/source state
+                    if has_found_transitions:
+                        ignored_states.update(ignored_state_selector(source))
+                        # Also ignore current state, as we found transitions in a higher
+                        # priority class
+                        ignored_states.add(source)
+                        break
 
         return selected_transitions
 
+    def _sort_sources(self, states: Iterable[str], *,
+                      inner_first=True) -> List[Tuple[str, List[Transition]]]:
+        """
+        Return the given states that have outgoing transitions, paired with these transitions,
+        in the order in which they have to be considered by *_select_transitions*: by depth
+        (w.r.t. *inner_first*), then by name.
+
+        :param states: state names to consider.
+        :param inner_first: True to follow inner-first/source state semantics.
+        :return: list of pairs (source state name, list of transitions).
+        """
+        depth = self._depth
+        sign = -1 if inner_first else 1
+        sources = sorted(
+            (state for state in states if state in self._transitions_from),
+            key=lambda s: (sign * depth[s], s))
+        return [(source, self._transitions_from[source]) for source in sources]
+
     def _sort_transitions(self, transitions: List[Transition]) -> List[Transition]:
         """
         Given a list of triggered transitions, return a list of transitions in an order that
@@ -504,11 +568,9 @@ class Interpreter:
             # do not conflict. Two transitions conflict if one of them leaves the parallel state
             for t1, t2 in combinations(transitions, 2):
                 # Check (1)
-                lca = cast(str, self._statechart.least_common_ancestor(t1.source, t2.source))
-                lca_state = self._statechart.state_for(lca)
-
+                lca = cast(str, self._least_common_ancestor(t1.source, t2.source))
                 # Their LCA must be an orthogonal state!
-                if not isinstance(lca_state, OrthogonalState):
+                if lca not in self._orthogonal_states:
                     raise NonDeterminismError(
                         'Non-determinist choice between transitions {t1} and {t2}'
                         '\nConfiguration is {c}\nEvent is {e}\nTransitions are:{t}\n'
@@ -519,14 +581,10 @@ class Interpreter:
                 # This check must be done wrt. to LCA, as the combination of from_states could
                 # come from nested parallel regions!
                 for transition in [t1, t2]:
-                    last_before_lca = transition.source
-                    for state in self._statechart.ancestors_for(transition.source):
-                        if state == lca:
-                            break
-                        last_before_lca = state
+                    last_before_lca = self._last_before(transition.source, lca)
                     # Target must be a descendant (or self) of this state
-                    if (transition.target and (transition.target not in [
-                            last_before_lca] + self._statechart.descendants_for(last_before_lca))):
+                    if (transition.target and transition.target != last_before_lca
+                            and transition.target not in self._descendants_set[last_before_lca]):
                         raise ConflictingTransitionsError(
                             'Conflicting transitions: {t1} and {t2}'
                             '\nConfiguration is {c}\nEvent is {e}\nTransitions are:{t}\n'
@@ -534,8 +592,8 @@ class Interpreter:
                         )
 
             # Define an arbitrary order based on the depth and the name of source states.
-            transitions = sorted(
-                transitions, key=lambda t: (-self._statechart.depth_for(t.source), t.source))
+            depth = self._depth
+            transitions = sorted(transitions, key=lambda t: (-depth[t.source], t.source))
 
         return transitions
 
@@ -572,6 +630,114 @@ class Interpreter:
 
         return self._create_steps(event, transitions)
 
+    def _update_cache(self) -> None:
+        """
+        (Re)compute the cached structure of the statechart if it has changed since
+        the last time this method was called.
+        """
+        statechart = self._statechart
+        if self._cache_version == statechart._version:
+            return
+        self._cache_version = statechart._version
+
+        self._states.clear()
+        self._depth.clear()
+        self._ancestors.clear()
+        self._descendants_set.clear()
+        self._document_order.clear()
+        self._lca.clear()
+        self._transitions_from.clear()
+        self._sources_cache.clear()
+        self._root_final_states.clear()
+        self._compound_states.clear()
+        self._orthogonal_states.clear()
+        self._history_states.clear()
+        self._deep_history_states.clear()
+        self._history_children.clear()
+        self._sorted_configuration = None
+
+        self._root = statechart.root
+
+        # Position of each state in a breadth-first traversal of the statechart. Restricted to
+        # the descendants of any state, it is the order returned by descendants_for.
+        if self._root is not None:
+            for i, name in enumerate([self._root] + statechart.descendants_for(self._root)):
+                self._document_order[name] = i
+
+        for name in statechart.states:
+            self._depth[name] = statechart.depth_for(name)
+            self._ancestors[name] = tuple(statechart.ancestors_for(name))
+            self._descendants_set[name] = frozenset(statechart.descendants_for(name))
+
+            state = statechart.state_for(name)
+            self._states[name] = state
+
+            # Kind of state, to avoid repeated isinstance checks
+            if isinstance(state, FinalState):
+                # Only final states that are children of the root terminate the execution
+                if statechart.parent_for(name) == self._root:
+                    self._root_final_states.add(name)
+            elif isinstance(state, CompoundState):
+                self._compound_states.add(name)
+            elif isinstance(state, OrthogonalState):
+                self._orthogonal_states.add(name)
+            elif isinstance(state, HistoryStateMixin):
+                self._history_states.add(name)
+                if isinstance(state, DeepHistoryState):
+                    self._deep_history_states.add(name)
+                self._history_children.setdefault(
+                    cast(str, statechart.parent_for(name)), []).append(name)
+
+        # Transitions are grouped by source state. Their event is a public attribute that can be
+        # changed at any time, and is therefore not part of the index.
+        for transition in statechart.transitions:
+            self._transitions_from.setdefault(transition.source, []).append(transition)
+
+    def _least_common_ancestor(self, name_first: str, name_second: str) -> Optional[str]:
+        """
+        Memoized version of *Statechart.least_common_ancestor*, based on the cached
+        ancestors of both states.
+
+        :param name_first: name of first state
+        :param name_second: name of second state
+        :return: name of deepest common ancestor or *None*
+        """
+        # LCA is symmetric, use a single entry for both orders
+        key = (name_first, name_second) if name_first <= name_second else (name_second, name_first)
+        try:
+            return self._lca[key]
+        except KeyError:
+            second_ancestors = set(self._ancestors[name_second])
+            lca = next(
+                (state for state in self._ancestors[name_first] if state in second_ancestors),
+                None)
+            self._lca[key] = lca
+            return lca
+
+    def _ancestors_below(self, name: str, ancestor: Optional[str]) -> Tuple[str, ...]:
+        """
+        Return the ancestors of given state that are descendants of *ancestor*, ordered by
+        decreasing depth. If *ancestor* is None, all the ancestors are returned.
+
+        :param name: name of the state
+        :param ancestor: name of one of its ancestors, or None
+        :return: state's ancestors below *ancestor*
+        """
+        ancestor_depth = 0 if ancestor is None else self._depth[ancestor]
+        return self._ancestors[name][:self._depth[name] - ancestor_depth - 1]
+
+    def _last_before(self, name: str, ancestor: Optional[str]) -> str:
+        """
+        Return the ancestor-or-self of given state that is a child of *ancestor*, or the
+        root state if *ancestor* is None.
+
+        :param name: name of the state
+        :param ancestor: name of one of its ancestors, or None
+        :return: name of the child of *ancestor* containing given state
+        """
+        ancestors = self._ancestors_below(name, ancestor)
+        return ancestors[-1] if ancestors else name
+
     def _create_steps(self, event: Optional[Event],
                       transitions: Iterable[Transition]) -> List[MicroStep]:
         """
@@ -589,37 +755,25 @@ class Interpreter:
                 returned_steps.append(MicroStep(event=event, transition=transition))
                 continue
 
-            lca = self._statechart.least_common_ancestor(transition.source, transition.target)
-            from_ancestors = self._statechart.ancestors_for(transition.source)
-            to_ancestors = self._statechart.ancestors_for(transition.target)
-
-            # Exited states
-            exited_states = []
+            lca = self._least_common_ancestor(transition.source, transition.target)
 
             # last_before_lca is the "highest" ancestor of from_state that is a child of LCA
-            last_before_lca = transition.source
-            for state in from_ancestors:
-                if state == lca:
-                    break
-                last_before_lca = state
-
-            # Take all the descendants of this state and list the ones that are active
-            # Mind the reversed order!
-            for descendant in self._statechart.descendants_for(last_before_lca)[::-1]:
-                # Only leave states that are currently active
-                if descendant in self._configuration:
-                    exited_states.append(descendant)
+            last_before_lca = self._last_before(transition.source, lca)
+
+            # Exited states are the active descendants of this state, in reversed
+            # breadth-first order
+            exited_states = sorted(
+                self._configuration.intersection(self._descendants_set[last_before_lca]),
+                key=self._document_order.__getitem__, reverse=True)
 
             # Add last_before_lca as it is a child of LCA that must be exited
             if last_before_lca in self._configuration:
                 exited_states.append(last_before_lca)
 
-            # Entered states
-            entered_states = [transition.target]
-            for state in to_ancestors:
-                if state == lca:
-                    break
-                entered_states.insert(0, state)
+            # Entered states, from the outermost one to the target
+            entered_states = list(self._ancestors_below(transition.target, lca))
+            entered_states.reverse()
+            entered_states.append(transition.target)
 
             returned_steps.append(
                 MicroStep(
@@ -642,23 +796,25 @@ class Interpreter:
         :return: A *MicroStep* instance or *None* if this statechart can not be more stabilized
         """
         # Check if we are in a set of "stable" states
-        leaves_names = self._statechart.leaf_for(names)
-        leaves = sorted([self._statechart.state_for(name) for name in leaves_names],
-                        key=lambda s: (-self._statechart.depth_for(s.name), s.name))
+        names = names if isinstance(names, (set, frozenset)) else set(names)
+        leaves = sorted(
+            [name for name in names if names.isdisjoint(self._descendants_set[name])],
+            key=lambda s: (-self._depth[s], s))
 
         for leaf in leaves:
-            if isinstance(
-                    leaf, FinalState) and self._statechart.parent_for(
-                    leaf.name) == self._statechart.root:
-                return MicroStep(exited_states=[leaf.name, cast(str, self._statechart.root)])
-            if isinstance(leaf, (ShallowHistoryState, DeepHistoryState)):
-                states_to_enter = cast(List[str], self._memory.get(leaf.name, [leaf.memory]))
-                states_to_enter.sort(key=lambda x: (self._statechart.depth_for(x), x))
-                return MicroStep(entered_states=states_to_enter, exited_states=[leaf.name])
-            elif isinstance(leaf, OrthogonalState) and self._statechart.children_for(leaf.name):
-                return MicroStep(entered_states=sorted(self._statechart.children_for(leaf.name)))
-            elif isinstance(leaf, CompoundState) and leaf.initial:
-                return MicroStep(entered_states=[leaf.initial])
+            if leaf in self._root_final_states:
+                return MicroStep(exited_states=[leaf, cast(str, self._root)])
+            if leaf in self._history_states:
+                memory = cast(HistoryStateMixin, self._states[leaf]).memory
+                states_to_enter = cast(List[str], self._memory.get(leaf, [memory]))
+                states_to_enter.sort(key=lambda x: (self._depth[x], x))
+                return MicroStep(entered_states=states_to_enter, exited_states=[leaf])
+            elif leaf in self._orthogonal_states and self._statechart.children_for(leaf):
+                return MicroStep(entered_states=sorted(self._statechart.children_for(leaf)))
+            elif leaf in self._compound_states:
+                initial = cast(CompoundState, self._states[leaf]).initial
+                if initial:
+                    return MicroStep(entered_states=[initial])
 
         return None
 
@@ -669,44 +825,51 @@ class Interpreter:
         :param step: *MicroStep* instance
         :return: a new MicroStep, completed with sent events
         """
-        entered_states = list(map(self._statechart.state_for, step.entered_states))
-        exited_states = list(map(self._statechart.state_for, step.exited_states))
+        states = self._states
+        entered_states = [states[name] for name in step.entered_states]
+        exited_states = [states[name] for name in step.exited_states]
 
-        active_configuration = set(self._configuration)  # Copy
+        # Copy of the configuration before any state is exited, needed to update history memory
+        active_configuration = set(self._configuration) if exited_states else set()
 
         sent_events = []  # type: List[Event]
 
+        # Local bindings for the loops below
+        configuration = self._configuration
+        evaluator = self._evaluator
+        evaluate_contract_conditions = self._evaluate_contract_conditions
+        raise_event = self._raise_event
+        time = self.time
+
         # Exit states
         for state in exited_states:
             # Execute exit action
-            sent_events.extend(self._evaluator.execute_on_exit(state))
-
-            # Deal with history
-            if isinstance(state, CompoundState):
-                # Look for an HistoryStateMixin among its children
-                for child_name in self._statechart.children_for(state.name):
-                    child = self._statechart.state_for(child_name)
-                    if isinstance(child, DeepHistoryState):
-                        # This MUST contain at least one element!
-                        active = active_configuration.intersection(
-                            self._statechart.descendants_for(state.name))
-                        assert len(active) >= 1
-                        self._memory[child.name] = list(active)
-                    elif isinstance(child, ShallowHistoryState):
-                        # This MUST contain exactly one element!
-                        active = active_configuration.intersection(
-                            self.statechart.children_for(state.name))
-                        assert len(active) == 1
-                        self._memory[child.name] = list(active)
+            sent_events.extend(evaluator.execute_on_exit(state))
+
+            # Deal with history, if this state has HistoryStateMixin children
+            for child_name in self._history_children.get(state.name, ()):
+                if child_name in self._deep_history_states:
+                    # This MUST contain at least one element!
+                    active = active_configuration.intersection(
+                        self._descendants_set[state.name])
+                    assert len(active) >= 1
+                    self._memory[child_name] = list(active)
+                else:
+                    # This MUST contain exactly one element!
+                    active = active_configuration.intersection(
+                        self.statechart.children_for(state.name))
+                    assert len(active) == 1
+                    self._memory[child_name] = list(active)
 
             # Remove state from active configuration
-            self._configuration.remove(state.name)
+            configuration.remove(state.name)
+            self._sorted_configuration = None
 
             # Postconditions
-            self._evaluate_contract_conditions(state, 'postconditions', step)
+            evaluate_contract_conditions(state, 'postconditions', step)
 
             # Notify properties
-            self._raise_event(MetaEvent('state exited', state=state.name))
+            raise_event(MetaEvent('state exited', state=state.name))
 
         # Execute transition
         if step.transition:
@@ -721,7 +884,7 @@ class Interpreter:
             self._evaluate_contract_conditions(step.transition, 'invariants', step)
 
             # Update idle time
-            self._idle_time[step.transition.source] = self.time
+            self._idle_time[step.transition.source] = time
 
             # Notify properties
             self._raise_event(MetaEvent(
@@ -734,22 +897,23 @@ class Interpreter:
         # Enter states
         for state in entered_states:
             # Preconditions
-            self._evaluate_contract_conditions(state, 'preconditions', step)
+            evaluate_contract_conditions(state, 'preconditions', step)
 
             # Execute entry action
-            sent_events.extend(self._evaluator.execute_on_entry(state))
+            sent_events.extend(evaluator.execute_on_entry(state))
 
             # Update configuration
-            self._configuration.add(state.name)
-            self._entry_time[state.name] = self.time
-            self._idle_time[state.name] = self.time
+            configuration.add(state.name)
+            self._sorted_configuration = None
+            self._entry_time[state.name] = time
+            self._idle_time[state.name] = time
 
             # Notify properties
-            self._raise_event(MetaEvent('state entered', state=state.name))
+            raise_event(MetaEvent('state entered', state=state.name))
 
         # Send events
-        for event in cast(Union[InternalEvent, MetaEvent], sent_events):
-            self._raise_event(event)
+        for event in cast(List[Union[InternalEvent, MetaEvent]], sent_events):
+            raise_event(event)
             self._sent_events.append(event)
 
         return MicroStep(event=step.event, transition=step.transition,
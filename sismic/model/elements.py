@@ -1,6 +1,8 @@
 from abc import ABCMeta
 from typing import List
 
+from ..utilities import intern_name
+
 __all__ = ['ContractMixin', 'StateMixin', 'ActionStateMixin', 'TransitionStateMixin',
            'CompositeStateMixin', 'HistoryStateMixin', 'BasicState', 'CompoundState',
            'OrthogonalState', 'ShallowHistoryState', 'DeepHistoryState', 'FinalState', 'Transition']
@@ -35,7 +37,7 @@ class StateMixin(metaclass=ABCMeta):
     """
 
     def __init__(self, name: str) -> None:
-        self._name = name
+        self._name = intern_name(name)
 
     @property
     def name(self):
@@ -305,8 +307,8 @@ class Transition(ContractMixin):
     def __init__(self, source: str, target: str = None, event: str = None, guard: str = None,
                  action: str = None, priority=None) -> None:
         ContractMixin.__init__(self)
-        self._source = source
-        self._target = target
+        self._source = intern_name(source)
+        self._target = intern_name(target)
         self.event = event
         self.guard = guard
         self.action = action
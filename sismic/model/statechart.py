@@ -2,6 +2,7 @@ from copy import deepcopy
 from typing import Callable, Dict, Iterable, List, Optional, Union, cast
 
 from ..exceptions import StatechartError
+from ..utilities import intern_name
 
 from .elements import (CompositeStateMixin, CompoundState, HistoryStateMixin,
                        StateMixin, Transition, TransitionStateMixin)
@@ -30,6 +31,9 @@ class Statechart:
 
         self._children[None] = []  # Root state
 
+        # Incremented each time states or transitions are modified, to invalidate caches
+        self._version = 0
+
     @property
     def root(self) -> Optional[str]:
         """
@@ -180,14 +184,12 @@ class Statechart:
         :raise StatechartError: if a state does not exist
         """
         leaves = []  # type: List[str]
-        names = set(names)  # Lookups in set are more efficient
+        if not isinstance(names, (set, frozenset)):
+            names = set(names)  # Lookups in set are more efficient
 
         for name in names:
             # Raise a StatechartError if it does not exist!
-            for descendant in self.descendants_for(name):
-                if descendant in names:
-                    break
-            else:  # no break occurs
+            if names.isdisjoint(self.descendants_for(name)):
                 leaves.append(name)
         return leaves
 
@@ -222,6 +224,7 @@ class Statechart:
             raise StatechartError('Unknown target state for {}'.format(transition))
 
         self._transitions.append(transition)
+        self._version += 1
 
     def remove_transition(self, transition: Transition) -> None:
         """
@@ -234,6 +237,7 @@ class Statechart:
             self._transitions.remove(transition)
         except ValueError:
             raise StatechartError('Transition {} does not exist'.format(transition))
+        self._version += 1
 
     def rotate_transition(self, transition: Transition, new_source: str = '',
                           new_target: Optional[str] = '') -> None:
@@ -256,6 +260,8 @@ class Statechart:
         if transition not in self._transitions:
             raise StatechartError('Unknown transition {}'.format(transition))
 
+        self._version += 1
+
         # Rotate using source
         if new_source != '':
             new_source_state = self.state_for(new_source)
@@ -394,6 +400,7 @@ class Statechart:
         self._parent[state.name] = parent
         self._children[state.name] = []
         self._children[parent].append(state.name)
+        self._version += 1
 
     def remove_state(self, name: str) -> None:
         """
@@ -430,6 +437,7 @@ class Statechart:
         self._children.pop(name)
 
         self._children[parent].remove(name)
+        self._version += 1
 
     def rename_state(self, old_name: str, new_name: str) -> None:
         """
@@ -440,6 +448,7 @@ class Statechart:
         """
         if old_name == new_name:
             return
+        new_name = intern_name(new_name)
         if new_name in self._states:
             raise StatechartError('State {} already exists!'.format(new_name))
 
@@ -482,6 +491,7 @@ class Statechart:
 
         # Rename state!
         state._name = new_name
+        self._version += 1
 
     def move_state(self, name: str, new_parent: str) -> None:
         """
@@ -508,6 +518,7 @@ class Statechart:
         self._parent[name] = new_parent
         self._children[old_parent].remove(name)
         self._children.setdefault(new_parent, []).append(name)
+        self._version += 1
 
         # Check memory property
         if isinstance(state, HistoryStateMixin):
@@ -557,6 +568,7 @@ class Statechart:
         statechart_copy.rename_state(source, replace)
         source_name = replace  # For lisibility
         self._states[replace] = statechart_copy.state_for(source_name)
+        self._version += 1
         for name in statechart_copy.descendants_for(source_name):
             new_name = renaming_func(name)
             # May raise a StatechartError if names collides in source statechart.
@@ -1,4 +1,5 @@
-from typing import List, Optional
+from itertools import chain
+from typing import Iterable, List, Optional
 
 from .elements import Transition
 from .events import Event
@@ -14,23 +15,81 @@ class MicroStep:
     of *entered_states* and a list of *exited_states*.
     Order in the two lists is REALLY important!
 
+    The parameters are exposed as read-only properties. List properties return copies,
+    so a step cannot be modified in place: create a new *MicroStep* instead.
+
     :param event: Event or None in case of eventless transition
     :param transition: a *Transition* or None if no processed transition
     :param entered_states: possibly empty list of entered states
     :param exited_states: possibly empty list of exited states
     :param sent_events: a possibly empty list of events that are sent during the step
+
+    Two micro steps are equal if their event, transition, entered states, exited states and
+    sent events are equal. The event and transition of a step must not be modified once it
+    is hashed.
     """
 
-    __slots__ = ['event', 'transition', 'entered_states', 'exited_states', 'sent_events']
+    __slots__ = ['_event', '_transition', '_entered_states', '_exited_states', '_sent_events']
+
+    def __init__(self, event: Optional[Event] = None, transition: Optional[Transition] = None,
+                 entered_states: Optional[List[str]] = None,
+                 exited_states: Optional[List[str]] = None,
+                 sent_events: Optional[List[Event]] = None) -> None:
+        self._event = event
+        self._transition = transition
+        self._entered_states = tuple(entered_states) if entered_states else ()
+        self._exited_states = tuple(exited_states) if exited_states else ()
+        self._sent_events = tuple(sent_events) if sent_events else ()
 
-    def __init__(self, event: Event = None, transition: Transition = None,
-                 entered_states: List[str] = None, exited_states: List[str] = None,
-                 sent_events: List[Event] = None) -> None:
-        self.event = event
-        self.transition = transition
-        self.entered_states = entered_states if entered_states else []  # type: List[str]
-        self.exited_states = exited_states if exited_states else []  # type: List[str]
-        self.sent_events = sent_events if sent_events else []  # type: List[Event]
+    @property
+    def event(self) -> Optional[Event]:
+        """
+        Event (or *None*) that was considered.
+        """
+        return self._event
+
+    @property
+    def transition(self) -> Optional[Transition]:
+        """
+        Transition (or *None*) that was processed.
+        """
+        return self._transition
+
+    @property
+    def entered_states(self) -> List[str]:
+        """
+        List of the states names that were entered.
+        """
+        return list(self._entered_states)
+
+    @property
+    def exited_states(self) -> List[str]:
+        """
+        List of the states names that were exited.
+        """
+        return list(self._exited_states)
+
+    @property
+    def sent_events(self) -> List[Event]:
+        """
+        List of events that were sent during this step.
+        """
+        return list(self._sent_events)
+
+    def __eq__(self, other):
+        if isinstance(other, MicroStep):
+            return (
+                self._event == other._event
+                and self._transition == other._transition
+                and self._entered_states == other._entered_states
+                and self._exited_states == other._exited_states
+                and self._sent_events == other._sent_events
+            )
+        else:
+            return NotImplemented
+
+    def __hash__(self):
+        return hash((self._event, self._transition))
 
     def __repr__(self):
         params = []
@@ -52,21 +111,33 @@ class MacroStep:
     A macro step is a list of micro steps.
 
     :param time: the time at which this step was executed
-    :param steps: a list of *MicroStep* instances
+    :param steps: a list (or any iterable) of *MicroStep* instances
+
+    Two macro steps are equal if they were executed at the same time and their micro steps
+    are equal.
     """
 
-    def __init__(self, time: float, steps: List[MicroStep]) -> None:
+    def __init__(self, time: float, steps: Iterable[MicroStep]) -> None:
         self._time = time
-        self._steps = steps
+        self._steps = tuple(steps)
+
+        # Steps are stored as a tuple, derived values are computed once
+        steps = self._steps
+        self._event = next((step.event for step in steps if step.event), None)
+        self._transitions = tuple(step.transition for step in steps if step.transition)
+        self._entered_states = tuple(chain.from_iterable(step.entered_states for step in steps))
+        self._exited_states = tuple(chain.from_iterable(step.exited_states for step in steps))
+        self._sent_events = tuple(chain.from_iterable(step.sent_events for step in steps))
 
-    __slots__ = ['_time', '_steps']
+    __slots__ = ['_time', '_steps', '_event', '_transitions', '_entered_states',
+                 '_exited_states', '_sent_events']
 
     @property
     def steps(self) -> List[MicroStep]:
         """
         List of micro steps
         """
-        return self._steps
+        return list(self._steps)
 
     @property
     def time(self) -> float:
@@ -80,51 +151,47 @@ class MacroStep:
         """
         Event (or *None*) that was consumed.
         """
-        for step in self._steps:
-            if step.event:
-                return step.event
-        return None
+        return self._event
 
     @property
     def transitions(self) -> List[Transition]:
         """
         A (possibly empty) list of transitions that were triggered.
         """
-        return [step.transition for step in self._steps if step.transition]
+        return list(self._transitions)
 
     @property
     def entered_states(self) -> List[str]:
         """
         List of the states names that were entered.
         """
-        states = []  # type: List[str]
-        for step in self._steps:
-            states += step.entered_states
-        return states
+        return list(self._entered_states)
 
     @property
     def exited_states(self) -> List[str]:
         """
         List of the states names that were exited.
         """
-        states = []  # type: List[str]
-        for step in self._steps:
-            states += step.exited_states
-        return states
+        return list(self._exited_states)
 
     @property
     def sent_events(self) -> List[Event]:
         """
         List of events that were sent during this step.
         """
-        events = []
-        for step in self._steps:
-            for event in step.sent_events:
-                events.append(event)
-        return events
+        return list(self._sent_events)
+
+    def __eq__(self, other):
+        if isinstance(other, MacroStep):
+            return self._time == other._time and self._steps == other._steps
+        else:
+            return NotImplemented
+
+    def __hash__(self):
+        return hash((self._time, self._event))
 
     def __repr__(self):
-        return '{}({!r}, {!r})'.format(self.__class__.__name__, self.time, self._steps)
+        return '{}({!r}, {!r})'.format(self.__class__.__name__, self.time, self.steps)
 
     def __str__(self):
         return 'Step@{}({}, {}, >{}, <{})'.format(round(self.time, 3), self.event, self.transitions,
@@ -1,3 +1,5 @@
+import sys
+
 from collections import defaultdict
 
 
@@ -13,3 +15,11 @@ def sorted_groupby(iterable, key=None, reverse=False):
         return e[0]
 
     return sorted(groups.items(), key=sort_key, reverse=reverse)
+
+
+def intern_name(name):
+    """
+    Return an interned version of given (state) name, so that names used as keys of
+    dictionaries and sets can be compared by identity. Non-string values are returned as is.
+    """
+    return sys.intern(name) if type(name) is str else name
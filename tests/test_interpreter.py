@@ -3,11 +3,13 @@ import pickle
 
 from collections import Counter
 
-from sismic.exceptions import ExecutionError, NonDeterminismError, ConflictingTransitionsError
+from sismic.exceptions import (ExecutionError, NonDeterminismError, ConflictingTransitionsError,
+                               StatechartError)
 from sismic.code import DummyEvaluator
 from sismic.interpreter import Interpreter, Event, InternalEvent
 from sismic.helpers import coverage_from_trace, log_trace, run_in_background
-from sismic.model import Transition, MacroStep, MicroStep, MetaEvent
+from sismic.model import (Transition, MacroStep, MicroStep, MetaEvent, Statechart, CompoundState,
+                          BasicState)
 from sismic import testing
 
 
@@ -67,6 +69,24 @@ class TestInterpreterWithSimple:
         interpreter.execute_once()
         assert interpreter.configuration == ['root', 's3']
 
+    def test_transition_event_is_not_cached(self, interpreter):
+        # Select transitions from s1 once, so that anything that can be cached is cached
+        interpreter.queue('unknown').execute_once()
+
+        interpreter.statechart.transitions_from('s1')[0].event = 'other'
+        interpreter.queue('goto s2').execute_once()
+        assert interpreter.configuration == ['root', 's1']
+
+        interpreter.queue('other').execute_once()
+        assert interpreter.configuration == ['root', 's2']
+
+    def test_configuration_after_rename(self, interpreter):
+        assert interpreter.configuration == ['root', 's1']
+
+        interpreter.statechart.rename_state('s1', 'new s1')
+        with pytest.raises(StatechartError):
+            interpreter.configuration
+
     def test_simple_entered(self, interpreter):
         interpreter.queue('goto s2')
         assert interpreter.execute_once().entered_states == ['s2']
@@ -472,6 +492,50 @@ class TestTransitionPriority:
         assert interpreter.configuration == ['root', 'c']
 
 
+class TestModifiedTransitions:
+    @pytest.fixture()
+    def interpreter(self):
+        statechart = Statechart('modified transitions')
+        statechart.add_state(CompoundState('root', initial='a'), None)
+        for name in ['a', 'b', 'c']:
+            statechart.add_state(BasicState(name), 'root')
+        statechart.add_transition(Transition('a', 'b', event='e'))
+        statechart.add_transition(Transition('a', 'c', event='e', priority=Transition.LOW_PRIORITY))
+        statechart.add_transition(Transition('b', 'a', event='back'))
+        statechart.add_transition(Transition('c', 'a', event='back'))
+
+        interpreter = Interpreter(statechart)
+        interpreter.execute_once()
+
+        # Select transitions from a once, so that anything that can be cached is cached
+        interpreter.queue('e', 'back').execute()
+        assert interpreter.configuration == ['root', 'a']
+        return interpreter
+
+    def transition_to(self, interpreter, target):
+        for transition in interpreter.statechart.transitions_from('a'):
+            if transition.target == target:
+                return transition
+
+    def test_priority(self, interpreter):
+        self.transition_to(interpreter, 'c').priority = 5
+        interpreter.queue('e').execute()
+        assert interpreter.configuration == ['root', 'c']
+
+    def test_guard(self, interpreter):
+        self.transition_to(interpreter, 'b').guard = 'False'
+        interpreter.queue('e').execute()
+        assert interpreter.configuration == ['root', 'c']
+
+    def test_event(self, interpreter):
+        self.transition_to(interpreter, 'b').event = 'f'
+        interpreter.queue('e').execute()
+        assert interpreter.configuration == ['root', 'c']
+
+        interpreter.queue('back', 'f').execute()
+        assert interpreter.configuration == ['root', 'b']
+
+
 class TestLogTrace:
     @pytest.fixture(autouse=True)
     def setup(self, elevator):
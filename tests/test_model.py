@@ -1,10 +1,82 @@
 import pytest
 
 from sismic.exceptions import StatechartError
-from sismic.model import Statechart, Transition, CompoundState, BasicState
+from sismic.model import Statechart, Transition, CompoundState, BasicState, MacroStep, MicroStep
 from sismic.interpreter import Event
 
 
+class TestMacroStep:
+    def test_derived_values(self):
+        t1, t2 = Transition('a', 'b'), Transition('b', 'c')
+        step = MacroStep(0, steps=[
+            MicroStep(event=Event('e'), transition=t1, entered_states=['b'], exited_states=['a'],
+                      sent_events=[Event('x')]),
+            MicroStep(entered_states=['b1', 'b2']),
+            MicroStep(transition=t2, entered_states=['c'], exited_states=['b2', 'b1', 'b'],
+                      sent_events=[Event('y')]),
+        ])
+        assert step.event == Event('e')
+        assert step.transitions == [t1, t2]
+        assert step.entered_states == ['b', 'b1', 'b2', 'c']
+        assert step.exited_states == ['a', 'b2', 'b1', 'b']
+        assert step.sent_events == [Event('x'), Event('y')]
+
+    def test_empty(self):
+        step = MacroStep(0, steps=[])
+        assert step.event is None
+        assert step.transitions == step.entered_states == step.exited_states == step.sent_events == []
+
+    def test_steps_from_generator(self):
+        t = Transition('a', 'b')
+        steps = [MicroStep(event=Event('e'), transition=t, entered_states=['b'], exited_states=['a'],
+                           sent_events=[Event('x')])]
+        step = MacroStep(0, steps=(s for s in steps))
+
+        assert step.steps == steps
+        assert step.event == Event('e')
+        assert step.transitions == [t]
+        assert step.entered_states == ['b']
+        assert step.exited_states == ['a']
+        assert step.sent_events == [Event('x')]
+
+    def test_returned_lists_are_copies(self):
+        steps = [MicroStep(entered_states=['a'], sent_events=[Event('x')])]
+        step = MacroStep(0, steps=steps)
+
+        step.entered_states.append('b')
+        step.sent_events.append(Event('y'))
+        step.steps.append(MicroStep(entered_states=['c']))
+        steps.append(MicroStep(entered_states=['d']))
+
+        assert step.entered_states == ['a']
+        assert step.sent_events == [Event('x')]
+        assert len(step.steps) == 1
+
+    def test_micro_step_is_read_only(self):
+        entered_states = ['a']
+        step = MicroStep(entered_states=entered_states)
+        entered_states.append('b')
+        step.entered_states.append('c')
+        assert step.entered_states == ['a']
+
+        with pytest.raises(AttributeError):
+            step.event = Event('e')
+
+    def test_equality(self):
+        def create_step(time):
+            return MacroStep(time, steps=[
+                MicroStep(event=Event('e'), transition=Transition('a', 'b'),
+                          entered_states=['b'], exited_states=['a']),
+                MicroStep(entered_states=['b1']),
+            ])
+
+        assert create_step(0) == create_step(0)
+        assert hash(create_step(0)) == hash(create_step(0))
+        assert create_step(0) != create_step(1)
+        assert MicroStep(entered_states=['a']) != MicroStep(entered_states=['b'])
+        assert len({create_step(0), create_step(0), create_step(1)}) == 2
+
+
 class TestEvents:
     def test_create_event(self):
         assert Event('hello') == Event(name='hello')